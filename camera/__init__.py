@@ -1,4 +1,5 @@
 
 # local imports
-from .camera import Camera, CameraInitFailed
+from .camera import (Camera, CameraInitFailed, get_abilities_list,
+                     get_ports)
 
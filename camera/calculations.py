@@ -1,37 +1,66 @@
 
 # standard imports
+import bisect
+from functools import lru_cache
 import math
 
 
 def find_nearest(iterable, value, distance=min, evaluator=None):
-    """Returns the index and value closest to a given value."""
-    def key(x):
-        i, x = x
-        if x is None:
-            return float('inf')
-        try:
-            return abs(value - x)
-        except ValueError:
-            return float('inf')
-        except TypeError:
-            return float('inf')
+    """Returns the index and value closest to a given value. Values that are
+    None are never closest."""
     if evaluator:
         iterable = [evaluator(x) for x in iterable]
-    return min(enumerate(iterable), key=key)
+    # Coerce the value once, rather than checking each comparison.
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        value = None
+    # A single pass, keeping the first of any equally close values.
+    best_i, best_x, best_d = None, None, None
+    for i, x in enumerate(iterable):
+        if value is None or x is None:
+            d = float('inf')
+        else:
+            d = abs(value - x)
+        if best_d is None or d < best_d:
+            best_i, best_x, best_d = i, x, d
+    if best_i is None:
+        raise ValueError("find_nearest() arg is an empty sequence")
+    return best_i, best_x
 
 
+def find_nearest_sorted(values, value, stops):
+    """Returns the index of the sorted value closest to a given value, with
+    the distance measured in stops by the given function."""
+    if value is None or not values:
+        raise ValueError(f"Cannot find nearest value to {value}")
+    i = bisect.bisect_left(values, value)
+    if i == 0:
+        return 0
+    if i == len(values):
+        return i - 1
+    # Only the neighbors on either side can be the closest.
+    target = stops(value)
+    lo_distance = abs(target - stops(values[i - 1]))
+    hi_distance = abs(stops(values[i]) - target)
+    return i - 1 if lo_distance <= hi_distance else i
+
+
+@lru_cache(maxsize=256)
 def iso_stops(iso):
     """Return the number of stops corresponding to the given ISO, where ISO
     100 is the baseline, at zero stops."""
     return math.log(iso/100, 2)
 
 
+@lru_cache(maxsize=256)
 def ss_stops(ss):
     """Return the number of stops corresponding to the given shutter speed,
     where 1 second is the baseline, at zero stops."""
     return math.log(ss, 2)
 
 
+@lru_cache(maxsize=256)
 def fstop_stops(ap):
     """Return the number of stops corresponding to the given aperture, where
     f/1 is 0 stops."""
@@ -1,5 +1,6 @@
 # standard imports
 import logging
+import time
 import traceback as tb
 
 # package imports
@@ -11,6 +12,28 @@ from gphoto2 import GPhoto2Error
 import gphoto2 as gp
 
 
+# Ability list, loaded once per process; the camera drivers don't change.
+_ABILITIES = None
+
+
+def get_ports():
+    """Returns a freshly loaded gp.PortInfoList. Not cached, since it holds
+    the devices attached right now, which change as cameras are plugged in."""
+    ports = gp.PortInfoList()
+    ports.load()
+    return ports
+
+
+def get_abilities_list():
+    """Returns the loaded gp.CameraAbilitiesList, loading it on first use."""
+    global _ABILITIES
+    if _ABILITIES is None:
+        abilities_list = gp.CameraAbilitiesList()
+        abilities_list.load()
+        _ABILITIES = abilities_list
+    return _ABILITIES
+
+
 class CameraInitFailed(Exception):
     """Conveys that camera initialization failed, or no cameras were found."""
     
@@ -21,20 +44,21 @@ class CameraInitFailed(Exception):
 class Camera:
     """Decorates a gp.Camera object."""
 
-    def __init__(self, model=None, port=None, delete=False):
+    def __init__(self, model=None, port=None, delete=False, dump=False):
         self.gp_camera = gp.Camera()
         self._select(model, port)
         self.iso_ctrl = None
         self.aperture_ctrl = None
         self.shutterspeed_ctrl = None
         self.delete_images = delete
+        self._preview_file = gp.CameraFile()
         try:
             self.gp_camera.init()
         except gp.GPhoto2Error:
             # Hide the old exception when reporting this one.
             raise CameraInitFailed("No cameras detected") from None
         gp_widget = self.gp_camera.get_config()
-        self.config = CameraConfig(gp_widget)
+        self.config = CameraConfig(gp_widget, dump=dump)
 
 
     def _select(self, model, port):
@@ -45,13 +69,9 @@ class Camera:
             logging.info("Selecting first available camera")
             return
 
-        # Load port data.
-        ports = gp.PortInfoList()
-        ports.load()
-
-        # Load ability data.
-        abilities_list = gp.CameraAbilitiesList()
-        abilities_list.load()
+        # Load port and ability data.
+        ports = get_ports()
+        abilities_list = get_abilities_list()
 
         # Detect cameras.
         detected_cameras = abilities_list.detect(ports)
@@ -83,10 +103,10 @@ class Camera:
         port_idx = ports.lookup_path(port)
         abil_idx = abilities_list.lookup_model(model)
 
-        logging.debug(f"port index: {port_idx}")
+        logging.debug("port index: %s", port_idx)
         self.gp_camera.set_port_info(ports[port_idx])
 
-        logging.debug(f"model index: {abil_idx}")
+        logging.debug("model index: %s", abil_idx)
         self.gp_camera.set_abilities(abilities_list[abil_idx])
 
 
@@ -110,26 +130,31 @@ class Camera:
 
     def set_aperture(self, aperture: str):
         """Sets the aperture value for the next `apply_settings()` call."""
-        logging.info(f"Setting aperture to \"{aperture}\"")
+        logging.info("Setting aperture to \"%s\"", aperture)
         self.config.aperture_ctrl.select(aperture)
 
 
     def set_shutter_speed(self, shutter: str):
         """Sets the shutter speed value for the next `apply_settings()` call."""
-        logging.info(f"Setting shutter speed to \"{shutter}\"")
+        logging.info("Setting shutter speed to \"%s\"", shutter)
         self.config.shutterspeed_ctrl.select(shutter)
 
 
     def set_iso(self, iso: str):
         """Sets the iso for the next `apply_settings()` call."""
-        logging.info(f"Setting iso to \"{iso}\"")
+        logging.info("Setting iso to \"%s\"", iso)
         self.config.iso_ctrl.select(iso)
 
 
-    def apply_settings(self):
-        """Applies exposure settings, updating the camera."""
-        gp_widget = self.config.gp_widget
-        self.gp_camera.set_config(gp_widget)
+    def apply_settings(self, force=False):
+        """Applies exposure settings, updating the camera. Nothing is sent
+        if no setting changed, unless `force` is set."""
+        config = self.config
+        if not (force or config.dirty):
+            logging.debug("Settings unchanged, not applying")
+            return
+        self.gp_camera.set_config(config.gp_widget)
+        config.mark_clean()
 
 
     def trigger_capture(self):
@@ -137,13 +162,16 @@ class Camera:
         self.gp_camera.trigger_capture()
 
 
-    def trigger_capture_and_wait(self, timeout=100, max_iters=10):
+    def trigger_capture_and_wait(self, timeout=10, max_wait=1.0):
         """Trigger a capture, wait for the camera to be ready again, """
         """and delete the image if configured to."""
 
-        # timout is 1/1000 s (so 100 is 1/10 s)
+        # timeout is 1/1000 s (so 10 is 1/100 s), per event poll.
+        # max_wait is in seconds, for the whole wait.
         gp_camera = self.gp_camera
         gp_camera.trigger_capture()
+        # Only the wait for events counts against max_wait.
+        deadline = time.monotonic() + max_wait
         event = None
         # 1: timeout
         # 2: file added
@@ -152,7 +180,6 @@ class Camera:
         # 5: file changed
         ends = [gp.GP_EVENT_CAPTURE_COMPLETE,
                 gp.GP_EVENT_FILE_ADDED]
-        iters = 0
         while event not in ends:
             try:
                 event, data = gp_camera.wait_for_event(timeout)
@@ -161,10 +188,10 @@ class Camera:
                 break
             if event == gp.GP_EVENT_FILE_ADDED:
                 if self.delete_images:
-                    logging.info(f"Deleting image: {data.folder}/{data.name}")
+                    logging.info("Deleting image: %s/%s",
+                                 data.folder, data.name)
                     gp_camera.file_delete(data.folder, data.name)
-            iters += 1
-            if iters >= max_iters: break
+            if time.monotonic() > deadline: break
 
 
     def capture(self):
@@ -174,9 +201,10 @@ class Camera:
 
 
     def preview(self):
-        """Retrieve an image of the camera's live view."""
-        image = gp.CameraFile()
-        self.gp_camera.capture_preview(image)
-        return image
+        """Retrieve an image of the camera's live view. The returned buffer
+        is reused, and overwritten by the next call, so copy the data out of
+        it if it needs to be kept."""
+        self.gp_camera.capture_preview(self._preview_file)
+        return self._preview_file
 
 
@@ -1,121 +1,194 @@
 
 # standard imports
+from collections import deque
 import logging
+from operator import attrgetter, methodcaller
+import sys
 
 # third-party imports
 import gphoto2 as gp
 
 # package imports
 from .controllers import *
-
-
-# Keywords for searching settings, to accommodate different makes.
-ISO_KEYWORDS = [ 'iso' ]
-APERTURE_KEYWORDS = [ 'aperture', 'f-number' ]
-SHUTTER_SPEED_KEYWORDS = [ 'shutterspeed' ]
+from .dump import dump_widget
+
+
+# Keywords for searching settings, to accommodate different makes, most
+# preferred first, for cameras that have more than one.
+ISO_KEYWORDS = ( 'iso', )
+APERTURE_KEYWORDS = ( 'f-number', 'aperture' )
+SHUTTER_SPEED_KEYWORDS = ( 'shutterspeed', )
+
+# Each setting's keywords, with (CameraConfig attribute, description,
+# controller).
+_SETTINGS = [
+    (ISO_KEYWORDS, ('iso_ctrl', 'iso', IsoController)),
+    (APERTURE_KEYWORDS, ('aperture_ctrl', 'aperture', ApertureController)),
+    (SHUTTER_SPEED_KEYWORDS,
+     ('shutterspeed_ctrl', 'shutter speed', ShutterSpeedController)),
+]
+# Widget names mapped to (CameraConfig attribute, description, controller).
+_KW_DISPATCH = {
+    name: entry
+    for keywords, entry in _SETTINGS
+    for name in keywords
+}
+# Widget names mapped to (CameraConfig attribute, preference).
+_KW_RANKS = {
+    name: (entry[0], rank)
+    for keywords, entry in _SETTINGS
+    for rank, name in enumerate(keywords)
+}
+
+
+# Widget types, and which values to extract for each:
+# (wtype, get_choices, get_toggle, get_range, get_value)
+WIDGET_TYPES = {
+    gp.GP_WIDGET_WINDOW: ('window', False, False, False, False),
+    gp.GP_WIDGET_SECTION: ('section', False, False, False, False),
+    gp.GP_WIDGET_TEXT: ('text', False, False, False, True),
+    gp.GP_WIDGET_RANGE: ('range', False, False, True, True),
+    gp.GP_WIDGET_TOGGLE: ('toggle', False, True, False, True),
+    gp.GP_WIDGET_RADIO: ('radio', True, False, False, True),
+    gp.GP_WIDGET_MENU: ('menu', True, False, False, True),
+    gp.GP_WIDGET_BUTTON: ('button', False, False, False, False),
+    gp.GP_WIDGET_DATE: ('date', False, False, False, True),
+}
+UNKNOWN_WIDGET_TYPE = ('unknown', False, False, False, False)
+
+# Shared by all toggle widgets; choices are read-only once built.
+_TOGGLE_CHOICES = (0, 1)
 
 
 class Widget:
     """Decorates a gp.widget object tree"""
 
     def __init__(self, gp_widget):
-        self._build(gp_widget, self)
+        # Decorate the whole tree from a worklist, rather than recursively.
+        pending = deque([(gp_widget, self)])
+        while pending:
+            gp_node, node = pending.popleft()
+            self._build(gp_node, node)
+            for gp_child in gp_node.get_children():
+                child = Widget.__new__(Widget)
+                node.children.append(child)
+                pending.append((gp_child, child))
+
+
+    @property
+    def label(self):
+        """The widget label, fetched only when first needed."""
+        if self._label is None:
+            self._label = self.gp_widget.get_label()
+        return self._label
 
 
     def _build(self, gp_widget, widget):
+        # Extract values depending on the widget type.
+        (widget.wtype, get_choices, get_toggle, get_range,
+         get_value) = WIDGET_TYPES.get(gp_widget.get_type(),
+                                       UNKNOWN_WIDGET_TYPE)
+
         widget.gp_widget = gp_widget
-        widget.name = gp_widget.get_name()
-        widget.label = gp_widget.get_label()
+        widget.name = sys.intern(gp_widget.get_name())
+        widget._label = None
         widget.choices = None
         widget.range = None
         widget.value = None
         widget.children = []
 
-        wtype = gp_widget.get_type()
-        get_choices, get_toggle, get_range, get_value = [False] * 4
-
-        # Extract values depending on the widget type.
-        match wtype:
-            case gp.GP_WIDGET_SECTION:
-                widget.wtype = 'section'
-
-            case gp.GP_WIDGET_TEXT:
-                widget.wtype = 'text'
-                get_value = True
-
-            case gp.GP_WIDGET_RANGE:
-                widget.wtype = 'range'
-                get_range = True
-                get_value = True
-
-            case gp.GP_WIDGET_TOGGLE:
-                widget.wtype = 'toggle'
-                get_toggle = True
-                get_value = True
-
-            case gp.GP_WIDGET_RADIO:
-                widget.wtype = 'radio'
-                get_choices = True
-                get_value = True
-
-            case gp.GP_WIDGET_MENU:
-                widget.wtype = 'menu'
-                get_choices = True
-                get_value = True
-
-            case gp.GP_WIDGET_DATE:
-                widget.wtype = 'date'
-                get_value = True
-
         if get_choices:
-            widget.choices = list(gp_widget.get_choices())
+            # Interned, so that resolved choices cached by the controllers
+            # share these strings.
+            widget.choices = tuple(sys.intern(x)
+                                   for x in gp_widget.get_choices())
 
         if get_range:
-            widget.slider = list(gp_widget.get_range())
+            widget.range = tuple(gp_widget.get_range())
 
         if get_value:
             widget.value = gp_widget.get_value()
 
         if get_toggle:
-            widget.choices = [0, 1]
-
-        # Descend into child nodes.
-        for gp_child in gp_widget.get_children():
-            new_child = Widget(gp_child)
-            widget.children.append(new_child)
+            widget.choices = _TOGGLE_CHOICES
+
+
+def find_by_name(root, wanted, name_of, children_of):
+    """Returns {key: node} for the preferred node found for each key, where
+    `wanted` maps node names to (key, rank), and lower ranks are preferred;
+    among equal ranks, the first found wins. Stops once every key has a node
+    of rank 0."""
+    best = { }
+    unranked = { key for key, _ in wanted.values() }
+    # Walk the tree depth-first, in order, asking only for names.
+    stack = [root]
+    while stack and unranked:
+        node = stack.pop()
+        key, rank = wanted.get(name_of(node), (None, None))
+        if key is not None and (key not in best or rank < best[key][0]):
+            best[key] = (rank, node)
+            if rank == 0:
+                unranked.discard(key)
+        stack.extend(reversed(list(children_of(node))))
+    return { key: node for key, (_, node) in best.items() }
 
 
 class CameraConfig:
     """Decorate a gp.widget object"""
 
-    def __init__(self, gp_widget):
+    def __init__(self, gp_widget, dump=False):
         self.gp_widget = gp_widget
-        self.widget = Widget(gp_widget)
         self.iso_ctrl = None
         self.aperture_ctrl = None
         self.shutterspeed_ctrl = None
-        self._populate()
-
-
-    def _populate(self):
-        def check_widget(widget):
-
-            if widget.name in ISO_KEYWORDS:
-                logging.info(f"Found iso widget {widget.name}")
-                self.iso_ctrl = IsoController(widget)
-            elif widget.name in APERTURE_KEYWORDS:
-                logging.info(f"Found aperture widget {widget.name}")
-                self.aperture_ctrl = ApertureController(widget)
-            elif widget.name in SHUTTER_SPEED_KEYWORDS:
-                logging.info(f"Found shutter speed widget {widget.name}")
-                self.shutterspeed_ctrl = ShutterSpeedController(widget)
-            for child in widget.children:
-                check_widget(child)
-
-        check_widget(self.widget)
+        # The whole tree is only needed for dumping; otherwise just find the
+        # widgets the controllers need, and decorate those.
+        # Both ways pick the same widgets.
+        if dump:
+            self.widget = Widget(gp_widget)
+            found = find_by_name(self.widget, _KW_RANKS,
+                                 attrgetter('name'), attrgetter('children'))
+            for widget in found.values():
+                self._add_controller(widget)
+        else:
+            self.widget = None
+            found = find_by_name(gp_widget, _KW_RANKS,
+                                 methodcaller('get_name'),
+                                 methodcaller('get_children'))
+            for gp_node in found.values():
+                self._add_controller(Widget(gp_node))
+
+
+    def _add_controller(self, widget):
+        """Creates the controller for the widget, if it is a setting."""
+        entry = _KW_DISPATCH.get(widget.name)
+        if entry:
+            attr, description, ctrl_cls = entry
+            logging.info("Found %s widget %s", description, widget.name)
+            setattr(self, attr, ctrl_cls(widget))
+
+
+    def _controllers(self):
+        """Returns the controllers that were found."""
+        ctrls = [self.iso_ctrl, self.aperture_ctrl, self.shutterspeed_ctrl]
+        return [ctrl for ctrl in ctrls if ctrl]
+
+
+    @property
+    def dirty(self):
+        """Whether any setting changed since the last `mark_clean()`."""
+        return any(ctrl.dirty for ctrl in self._controllers())
+
+
+    def mark_clean(self):
+        """Notes that all settings have been applied to the camera."""
+        for ctrl in self._controllers():
+            ctrl.dirty = False
 
 
     def dump(self):
-        dump_widget(self.gp_widget)
+        if self.widget is None:
+            self.widget = Widget(self.gp_widget)
+        dump_widget(self.widget)
 
 
@@ -1,146 +1,253 @@
 
 # standard imports
+from collections import OrderedDict
+from functools import lru_cache
 import logging
+import re
 
 # package imports
-from .calculations import *
+from .calculations import (find_nearest_sorted, fstop_stops, iso_stops,
+                           ss_stops)
 
 
-class ApertureController:
-    """Select the aperture setting, accepting different notations."""
-    
+# Patterns for normalizing settings given in different notations.
+_NUMBER = r'(\d+(?:\.\d*)?|\.\d+)'
+# e.g. 8, f/8, 1/8
+_FSTOP_RE = re.compile(r'^(?:f/|1/)?' + _NUMBER + r'$')
+# e.g. 0.5, 1/2, 2s, 2", 1m
+_SS_RE = re.compile(r'^(?:' + _NUMBER + r'/)?' + _NUMBER + r'([sm"]?)$')
+# Multipliers to seconds, by shutter speed suffix.
+_SS_SUFFIX = { '': 1, 's': 1, '"': 1, 'm': 60 }
+
+
+@lru_cache(maxsize=256)
+def _normalize_fstop(fstop):
+    """Normalize aperture, e.g. 8, 1/8, f/8 --> 8"""
+
+    m = _FSTOP_RE.match(fstop.strip())
+    if m:
+        return float(m.group(1))
+    logging.error("Cannot handle aperture %s", fstop)
+    return None
+
+
+@lru_cache(maxsize=256)
+def _normalize_ss(ss):
+    """Normalize ss, e.g. 1/2 to 0.5"""
+
+    m = _SS_RE.match(ss.strip())
+    if m:
+        num, den, suffix = m.groups()
+        if num is None:
+            return float(den) * _SS_SUFFIX[suffix]
+        if float(den):
+            return float(num) / float(den)
+    logging.error("Cannot handle shutter speed %s", ss)
+    return None
+
+
+class LRUCache(OrderedDict):
+    """Mapping that keeps only the most recently used `maxsize` items."""
+
+    def __init__(self, maxsize=64):
+        super().__init__()
+        self.maxsize = maxsize
+
+
+    def get(self, key, default=None):
+        try:
+            self.move_to_end(key)
+        except KeyError:
+            return default
+        return self[key]
+
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class Controller:
+    """Base class for controllers, tracking changes to the widget value."""
+
+    # Name of the setting, for messages.
+    description = None
+    # Converts normalized values to stops, for choosing the nearest choice.
+    stops = None
+
     def __init__(self, widget):
         self.widget = widget
-        self.fstop_strs = widget.choices
-        logging.info(f"Apertures: {self.fstop_strs}")
-        self.fstop_norms = [self._normalize_fstop(x)
-                               for x in self.fstop_strs]
-        self.fstop_map = { }
-
-
-    def select(self, fstop):
-        """Selects the aperture, but does not apply it."""
-
-        gp_widget = self.widget.gp_widget
-        if fstop in self.fstop_strs:
-            logging.info(f"Setting aperture to {fstop} directly")
-            gp_widget.set_value(fstop)
-        elif fstop in self.fstop_map:
-            logging.info(f"Setting aperture to {fstop} via cache")
-            gp_widget.set_value(self.fstop_map[fstop])
+        # The gphoto2 widget never changes, so skip the lookup when setting.
+        self._gp = widget.gp_widget
+        self.dirty = False
+        self._choices = frozenset(widget.choices)
+        # Choices by requested value, bounded for arbitrary inputs.
+        self._cache = LRUCache()
+        self._sorted_norms = []
+        self._sorted_strs = []
+
+
+    def resolve(self, value):
+        """Returns the camera choice for a value, or None if there is none."""
+        choice = self._cache.get(value)
+        if choice is not None:
+            return choice
+        if value in self._choices:
+            choice = value
         else:
-            logging.info(f"Need to look up aperture {fstop}")
-            try:
-                norm = self._normalize_fstop(fstop)
-                # Aperture isn't linear, but this will be fine.
-                i, v = find_nearest(self.fstop_norms, norm,
-                                    distance=fstop_stops)
-                closest_fstop = self.fstop_strs[i]
-                logging.info(f"Closest aperture: {closest_fstop}")
-                self.fstop_map[fstop] = closest_fstop
-                gp_widget.set_value(closest_fstop)
-            except ValueError:
-                logging.error(f"Cannot set fstop to {fstop}")
-
-
-    def _normalize_fstop(self, fstop):
-        """Normalize aperture, e.g. 8, 1/8, f/8 --> 8"""
-
-        match fstop.split('/', maxsplit=2):
-            case [den] | ['f', den] | ['1', den]:
-                return float(den)
-            case _:
-                logging.error(f"Cannot handle aperture {fstop}")
-        return None
-
-
-class IsoController:
-    """Select the iso setting."""
-    
-    def __init__(self, widget):
-        self.widget = widget
-        self.iso_strs = widget.choices
-        self.iso_ints = [int(x) if x.isdigit() else None
-                         for x in widget.choices]
-        self.iso_map = { }
+            choice = self._resolve(value)
+            if choice is None:
+                return None
+        self._cache[value] = choice
+        return choice
 
 
-    def select(self, iso):
-        """Selects the ISO, but does not apply it."""
+    def resolve_many(self, values):
+        """Returns the camera choices for several values, in order,
+        resolving each distinct value only once."""
+        resolved = { value: self.resolve(value) for value in set(values) }
+        return [resolved[value] for value in values]
+
+
+    def _resolve(self, value):
+        """Looks up the nearest camera choice to a value, or None."""
+        return NotImplemented
+
+
+    def select(self, value):
+        """Selects the setting, but does not apply it."""
+        choice = self.resolve(value)
+        if choice is not None:
+            logging.info("Setting %s to %s", self.description, choice)
+            self._set(choice)
 
-        gp_widget = self.widget.gp_widget
-        if iso in self.iso_strs:
-            logging.info(f"Setting iso to {iso} directly")
-            gp_widget.set_value(iso)
-        elif iso in self.iso_map:
-            logging.info(f"Setting iso to {iso} via cache")
-            gp_widget.set_value(self.iso_map[iso])
-        else:
-            try:
-                i, v = find_nearest(self.iso_ints, int(iso),
-                                    distance=iso_stops)
-                closest_iso = self.iso_strs[i]
-                logging.info(f"Closest iso: {closest_iso}")
-                self.iso_map[iso] = closest_iso
-                gp_widget.set_value(closest_iso)
-            except ValueError:
-                logging.error(f"Cannot set iso to {iso}")
-
-
-class ShutterSpeedController:
-    """Select the shutter speed, accepting different notations."""
+
+    def _sort_choices(self, choices, norms):
+        """Sorts the choices that have a normalized value, for bisecting."""
+        pairs = sorted((norm, choice) for norm, choice in zip(norms, choices)
+                       if norm is not None)
+        self._sorted_norms = [norm for norm, _ in pairs]
+        self._sorted_strs = [choice for _, choice in pairs]
+
+
+    def _nearest(self, norm):
+        """Returns the choice nearest to a normalized value, in stops."""
+        i = find_nearest_sorted(self._sorted_norms, norm, self.stops)
+        return self._sorted_strs[i]
+
+
+    def _set(self, value):
+        """Sets the widget value, if it differs from the last value set."""
+        widget = self.widget
+        if value != widget.value:
+            self._gp.set_value(value)
+            widget.value = value
+            self.dirty = True
+
+
+class ApertureController(Controller):
+    """Select the aperture setting, accepting different notations."""
+
+    description = 'aperture'
+    stops = staticmethod(fstop_stops)
 
     def __init__(self, widget):
-        self.widget = widget
-        self.ss_strs = widget.choices
-        self.ss_norms = [self._normalize_ss(x)
-                         for x in widget.choices]
-        self.ss_map = { }
+        super().__init__(widget)
+        self.fstop_strs = widget.choices
+        logging.info("Apertures: %s", self.fstop_strs)
+        self.fstop_norms = [_normalize_fstop(x) for x in self.fstop_strs]
+        self._sort_choices(self.fstop_strs, self.fstop_norms)
+        # Normalized values by string, including alternate notations.
+        self._norm_by_str = { }
+        for fstop, norm in zip(self.fstop_strs, self.fstop_norms):
+            if norm is None:
+                continue
+            base = fstop.removeprefix('f/')
+            for alias in [base, f"f/{base}", f"1/{base}"]:
+                self._norm_by_str.setdefault(alias, norm)
+
+
+    def _resolve(self, fstop):
+        """Looks up the nearest aperture choice, or None."""
+
+        logging.info("Need to look up aperture %s", fstop)
+        try:
+            norm = self._norm_by_str.get(fstop)
+            if norm is None:
+                norm = _normalize_fstop(fstop)
+            closest_fstop = self._nearest(norm)
+        except ValueError:
+            logging.error("Cannot set fstop to %s", fstop)
+            return None
+        logging.info("Closest aperture: %s", closest_fstop)
+        return closest_fstop
 
 
-    def select(self, ss):
-        """Selects the shutter speed, but does not apply it."""
+class IsoController(Controller):
+    """Select the iso setting."""
 
-        gp_widget = self.widget.gp_widget
-        if ss in self.ss_strs:
-            gp_widget.set_value(ss)
-        elif ss in self.ss_map:
-            gp_widget.set_value(self.ss_map[ss])
-        else:
-            try:
-                norm = self._normalize_ss(ss)
-                # Aperture isn't linear, but this will be fine.
-                i, v = find_nearest(self.ss_norms, norm,
-                                    distance=ss_stops)
-                closest_ss = self.ss_strs[i]
-                logging.info(f"Closest shutter speed: {closest_ss}")
-                self.ss_map[ss] = closest_ss
-                gp_widget.set_value(closest_ss)
-            except ValueError:
-                logging.error(f"Cannot set shutter speed to {ss}")
-
-
-    def _normalize_ss(self, ss):
-        """Normalize ss, e.g. 1/2 to 0.5"""
-
-        multiplier = 1
-        if ss.endswith('s') or ss.endswith('"'):
-            ss = ss[:-1]
-        elif ss.endswith('m'):
-            multiplier = 60
-            ss = ss[:-1]
+    description = 'iso'
+    stops = staticmethod(iso_stops)
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.iso_strs = widget.choices
+        # Sorted numeric choices, for bisecting, converted in one pass.
+        pairs = sorted((int(x), x) for x in self.iso_strs if x.isdigit())
+        self._sorted_norms = [norm for norm, _ in pairs]
+        self._sorted_strs = [iso for _, iso in pairs]
+
+
+    def _resolve(self, iso):
+        """Looks up the nearest ISO choice, or None."""
 
         try:
-            match ss.split('/', maxsplit=2):
-                case [den]:
-                    return float(den) * multiplier
-                case [num, den]:
-                    return float(num) / float(den)
-                case _:
-                    logging.error(f"Cannot handle shutter speed {ss}")
+            norm = int(iso)
+            closest_iso = self._nearest(norm)
         except ValueError:
-            logging.error(f"Could not handle shutter speed {ss}")
+            logging.error("Cannot set iso to %s", iso)
+            return None
+        logging.info("Closest iso: %s", closest_iso)
+        return closest_iso
+
 
-        return None
+class ShutterSpeedController(Controller):
+    """Select the shutter speed, accepting different notations."""
+
+    description = 'shutter speed'
+    stops = staticmethod(ss_stops)
 
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.ss_strs = widget.choices
+        self.ss_norms = [_normalize_ss(x) for x in self.ss_strs]
+        self._sort_choices(self.ss_strs, self.ss_norms)
+        # Normalized values by string, including alternate notations.
+        self._norm_by_str = { }
+        for ss, norm in zip(self.ss_strs, self.ss_norms):
+            if norm is None:
+                continue
+            base = ss.removesuffix('s').removesuffix('"')
+            aliases = [base, f"{base}s", f"{base}\""]
+            if norm >= 60 and norm % 60 == 0:
+                aliases.append(f"{int(norm // 60)}m")
+            for alias in aliases:
+                self._norm_by_str.setdefault(alias, norm)
+
+
+    def _resolve(self, ss):
+        """Looks up the nearest shutter speed choice, or None."""
+
+        try:
+            norm = self._norm_by_str.get(ss)
+            if norm is None:
+                norm = _normalize_ss(ss)
+            closest_ss = self._nearest(norm)
+        except ValueError:
+            logging.error("Cannot set shutter speed to %s", ss)
+            return None
+        logging.info("Closest shutter speed: %s", closest_ss)
+        return closest_ss
 
@@ -1,7 +1,4 @@
 
-# third-party imports
-import gphoto2 as gp
-
 
 def dump_abilities(abilities):
     """Print the values of a gp.CameraAbilities object"""
@@ -22,30 +19,40 @@ def dump_abilities(abilities):
     print(f"{abilities.usb_vendor=}")
 
 
-def dump_widget(widget, tabs=0):
-    tab = tabs * 4 * ' '
+def _dump_choices(widget, tab):
+    print(f"{tab}    choices: {', '.join(widget.choices)}")
+
+
+def _dump_range(widget, tab):
+    print(f"{tab}    range: {widget.range}")
 
-    print(f"{tab}{widget.get_label()} [{widget.get_name()}]:")
 
-    try:
-        print(f"{tab}    choices: {', '.join(widget.get_choices())}")
-    except gp.GPhoto2Error:
-        # choices N/A
-        pass
+def _dump_value(widget, tab):
+    print(f"{tab}    value: {widget.value}")
 
-    try:
-        print(f"{tab}    range: {widget.get_range()}")
-    except gp.GPhoto2Error:
-        # range N/A
-        pass
 
-    try:
-        print(f"{tab}    value: {widget.get_value()}")
-    except gp.GPhoto2Error:
-        # value N/A
-        pass
+# What to print for each widget type.
+_DUMPERS = {
+    'text': [_dump_value],
+    'range': [_dump_range, _dump_value],
+    'toggle': [_dump_value],
+    'radio': [_dump_choices, _dump_value],
+    'menu': [_dump_choices, _dump_value],
+    'date': [_dump_value],
+}
+
+
+def dump_widget(widget, tabs=0):
+    """Print a decorated Widget tree, from the values it already holds."""
+    # Walk the tree depth-first, in order, without recursing.
+    stack = [(widget, tabs)]
+    while stack:
+        widget, tabs = stack.pop()
+        tab = tabs * 4 * ' '
 
-    for c in widget.get_children():
-        dump_widget(c, tabs + 1)
+        print(f"{tab}{widget.label} [{widget.name}]:")
 
+        for dumper in _DUMPERS.get(widget.wtype, []):
+            dumper(widget, tab)
 
+        stack.extend((c, tabs + 1) for c in reversed(widget.children))
@@ -7,21 +7,22 @@
 
 # standard imports
 import argparse
-from datetime import datetime, timedelta
+from datetime import timedelta
+import itertools
 import logging
+import time
 
 # local imports
-from camera import Camera, CameraInitFailed
-
-# third-party imports
-import gphoto2 as gp
+from camera import (Camera, CameraInitFailed, get_abilities_list,
+                    get_ports)
 
 
 def list_cameras():
     """List information about attached cameras."""
-    # Load port data.
-    ports = gp.PortInfoList()
-    ports.load()
+    # Load port and ability data, one after the other: both go through
+    # libltdl, which is not thread-safe.
+    ports = get_ports()
+    abilities_list = get_abilities_list()
 
     # List ports.
     for i, port in enumerate(ports):
@@ -30,10 +31,6 @@ def list_cameras():
         dtype = port.get_type()
         print(f"port {i+1}: {name} on {path} [{dtype}]")
 
-    # Load ability data.
-    abilities_list = gp.CameraAbilitiesList()
-    abilities_list.load()
-
     # Detect cameras.
     detected_cameras = abilities_list.detect(ports)
 
@@ -45,11 +42,16 @@ def list_cameras():
 def do_print(args):
     """Handle the `print` subcommand."""
 
-    camera = Camera(args.model, args.port)
+    camera = Camera(args.model, args.port, dump=True)
     camera.dump()
     camera.close()
 
 
+def _ns_delta(ns):
+    """Converts nanoseconds to a timedelta, for display."""
+    return timedelta(microseconds=ns/1000)
+
+
 def do_test(args):
     """Handle the `test` subcommand."""
 
@@ -69,45 +71,71 @@ def do_test(args):
     #burst = args.burst or 1
     burst = 1
 
+    # Resolve each setting to a camera choice once, up front, and lay out
+    # every combination, so the loop below only applies ready values.
+    config = camera.config
+    aps = [x for x in config.aperture_ctrl.resolve_many(aps) if x]
+    isos = [x for x in config.iso_ctrl.resolve_many(isos) if x]
+    sss = [x for x in config.shutterspeed_ctrl.resolve_many(sss) if x]
+    schedule = list(itertools.product(aps, isos, sss))
+
+    # Work out once which settings change at each step, so the loop only
+    # makes the calls it needs. Each round starts by setting everything.
+    setters = (camera.set_aperture, camera.set_iso, camera.set_shutter_speed)
+    steps = []
+    prev = (None, None, None)
+    for settings in schedule:
+        changes = [(setter, value)
+                   for setter, value, old in zip(setters, settings, prev)
+                   if value != old]
+        steps.append((settings, changes))
+        prev = settings
+
     # Move around `t1` and `t2` to time different things.
+    # Timings are kept as integer nanoseconds, from the monotonic clock.
     timing = []
 
     exposure_count = 0
-    t_start = datetime.now()
+    t_start = time.perf_counter_ns()
 
     for _ in range(rounds):
-        for ap in aps:
-            camera.set_aperture(ap)
-            for iso in isos:
-                camera.set_iso(iso)
-                for ss in sss:
-                    print(f"Aperture {ap}, iso {iso}, ss {ss}")
-                    camera.set_shutter_speed(ss)
-                    camera.apply_settings()
-
-                    t1 = datetime.now()
-                    for count in range(burst):
-                        camera.trigger_capture_and_wait()
-                        exposure_count += 1
-                    t2 = datetime.now()
-                    delta = t2 - t1
-                    # Discount the shutter speed
-                    # TODO
-                    timing.append(delta)
-    t_end = datetime.now()
+        for (ap, iso, ss), changes in steps:
+            print(f"Aperture {ap}, iso {iso}, ss {ss}")
+            for setter, value in changes:
+                setter(value)
+            camera.apply_settings()
+
+            t1 = time.perf_counter_ns()
+            for count in range(burst):
+                camera.trigger_capture_and_wait()
+                exposure_count += 1
+            t2 = time.perf_counter_ns()
+            delta = t2 - t1
+            # Discount the shutter speed
+            # TODO
+            timing.append(delta)
+    t_end = time.perf_counter_ns()
 
     camera.close()
 
-    delta0 = timedelta()
     if timing:
+        # Gather the stats in a single pass over the timings.
+        tot = 0
+        tmin = tmax = timing[0]
+        for delta in timing:
+            tot += delta
+            if delta < tmin:
+                tmin = delta
+            elif delta > tmax:
+                tmax = delta
         print("Timing data per shot:")
-        print(f"tot: {sum(timing,start=delta0)}")
-        print(f"avg: {sum(timing,start=delta0)/len(timing)}")
-        print(f"min: {min(timing)}")
-        print(f"max: {max(timing)}")
+        print(f"tot: {_ns_delta(tot)}")
+        print(f"avg: {_ns_delta(tot/len(timing))}")
+        print(f"min: {_ns_delta(tmin)}")
+        print(f"max: {_ns_delta(tmax)}")
 
     delta1 = t_end - t_start
-    print(f"Total execution time: {delta1}")
+    print(f"Total execution time: {_ns_delta(delta1)}")
     print(f"Total exposures taken: {exposure_count}")
 
 
@@ -204,6 +232,7 @@ def main():
 
     # Enable gphoto2 logging.
     if args.debug_gphoto:
+        import gphoto2 as gp
         callback_obj = gp.check_result(gp.use_python_logging())
 
     # Execute the subcommand.
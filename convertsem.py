@@ -7,9 +7,6 @@ import logging
 # local imports
 from sem import ScriptParser, EventParser
 
-# third-party imports
-import gphoto2 as gp
-
 
 # Main function
 
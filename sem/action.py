@@ -4,19 +4,39 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 
 # module imports
-from .fields import *
-from .strconv import format_date, format_time
+from .strconv import format_date_time
 
 
 class Action(ABC):
     """Base class for actions that can be sequenced."""
-    
+
+    __slots__ = ('_time', '_formatted')
+
     def __init__(self, time: datetime):
         self.time = time
 
 
+    @property
+    def time(self):
+        return self._time
+
+
+    @time.setter
+    def time(self, time: datetime):
+        self._time = time
+        # Formatted again when next needed.
+        self._formatted = None
+
+
+    def _format_date_time(self):
+        """Returns the formatted date and time, formatting them only once."""
+        if self._formatted is None:
+            self._formatted = format_date_time(self._time)
+        return self._formatted
+
+
     def __lt__(self, other):
-        return self.time < other.time
+        return self._time < other._time
 
 
     @abstractmethod
@@ -25,13 +45,16 @@ class Action(ABC):
 
 
     @abstractmethod
-    def as_dict(self):
+    def as_row(self):
+        """Returns the values of all fields, in `FIELD_NAMES` order."""
         return NotImplemented
 
 
 class ActionTakePic(Action):
     """Represents the capture of an image."""
-    
+
+    __slots__ = ('shutter', 'aperture', 'iso', 'comment')
+
     def __init__(self, time, shutter, aperture, iso, comment):
         super().__init__(time)
         self.shutter = shutter
@@ -52,23 +75,22 @@ class ActionTakePic(Action):
 
 
     def columns(self):
-        date = format_date(self.time)
-        time = format_time(self.time)
+        date, time = self._format_date_time()
         return [date, time, 'PICT', self.shutter, self.aperture, self.iso,
                 self.comment]
 
 
-    def as_dict(self):
-        date = format_date(self.time)
-        time = format_time(self.time)
-        return { F_DATE: date, F_TIME: time, F_ACTION: 'PICT', F_SHUTTER:
-                self.shutter, F_APERTURE: self.aperture, F_ISO: self.iso,
-                F_COMMENT: self.comment }
+    def as_row(self):
+        date, time = self._format_date_time()
+        return (date, time, 'PICT', self.shutter, self.aperture, self.iso,
+                '', self.comment)
 
 
 class ActionPlay(Action):
     """Represents the playing of a sound file."""
 
+    __slots__ = ('soundfile', 'comment')
+
     def __init__(self, time, soundfile, comment):
         super().__init__(time)
         self.soundfile = soundfile
@@ -85,15 +107,12 @@ class ActionPlay(Action):
 
 
     def columns(self):
-        date = format_date(self.time)
-        time = format_time(self.time)
+        date, time = self._format_date_time()
         return [date, time, 'PLAY', self.soundfile, self.comment]
 
 
-    def as_dict(self):
-        date = format_date(self.time)
-        time = format_time(self.time)
-        return { F_DATE: date, F_TIME: time, F_ACTION: 'PLAY',
-                F_FILE: self.soundfile, F_COMMENT: self.comment }
+    def as_row(self):
+        date, time = self._format_date_time()
+        return (date, time, 'PLAY', '', '', '', self.soundfile, self.comment)
 
 
@@ -1,34 +1,16 @@
 
 # standard imports
+import bisect
 from datetime import datetime, timezone
+from functools import cached_property
 import logging
 import re
 
 # package imports
 from .strconv import parse_date_time, parse_time
 
-def find_bounds(sequence, target, key=None):
-    seq_forward = list(enumerate(sequence))
-    seq_reverse = list(reversed(seq_forward))
-
-    if key is None:
-        key = lambda x: x
-
-    def sub_search(sequence, check):
-        index, king = None, None
-        for i, item in sequence:
-            subitem = key(item)
-            if check(subitem):
-                index, king = i, item
-            else:
-                break
-        return index, king
-
-    min_index, min_king = sub_search(seq_forward,
-                                     lambda x: x <= target)
-    max_index, max_king = sub_search(seq_reverse,
-                                     lambda x: x >= target)
-    return ((min_index, min_king), (max_index, max_king))
+# Contact times are in UTC.
+_UTC = timezone.utc
 
 
 class EventManager:
@@ -39,11 +21,28 @@ class EventManager:
                  max_magnitude: float):
         self.events = events
         self.pre_magnitudes = pre_mags
-        self.post_magnitudes = list(reversed(post_mags))
+        self.post_magnitudes = post_mags
+        # Magnitudes and times as separate lists, for bisecting. Post
+        # magnitudes decrease, so they are negated to keep them increasing.
+        self._pre_mag_values = [mag for mag, _ in pre_mags]
+        self._pre_mag_times = [time for _, time in pre_mags]
+        self._post_mag_values = [-mag for mag, _ in post_mags]
+        self._post_mag_times = [time for _, time in post_mags]
         self.max_magnitude = max_magnitude or 1.0
         self.max_magnitude = float(self.max_magnitude)
+        # Event times by name; events don't change once parsed.
+        self._time_cache: { str : datetime } = { }
 
     def get_time(self, name) -> datetime:
+        """Returns the time of an event, working out each one only once."""
+        try:
+            return self._time_cache[name]
+        except KeyError:
+            pass
+        time = self._time_cache[name] = self._get_time(name)
+        return time
+
+    def _get_time(self, name) -> datetime:
         # Expected events
         # C1, C2, C3, C4, MAX: directly in self.events
         # MAGPRE <float>, MAGPOST <float>
@@ -60,10 +59,8 @@ class EventManager:
                 pct = self.max_magnitude * pct
                 # Compute duration between when the magnitude starts to
                 # increase from 0 (C1), up until it reaches its maximum (MAX).
-                t1 = self.get_time('C1')
-                t2 = self.get_time('C2')
+                t1, time = self._pre_span
                 # Method: linear
-                time = t2 - t1
                 offset = time * pct
                 return t1 + offset
             case ['MAGPOST', percent]:
@@ -72,9 +69,7 @@ class EventManager:
                 if time:
                     return time
                 # Like MAGPRE, but different events
-                t1 = self.get_time('C3')
-                t2 = self.get_time('C4')
-                delta = t2 - t1
+                t2, delta = self._post_span
                 offset = delta * pct
                 # unsure about this one
                 return t2 - offset
@@ -82,17 +77,43 @@ class EventManager:
         logging.error(f"Timing of event {name} failed!")
         return None
 
+    @cached_property
+    def _pre_span(self):
+        """C1, and the duration from C1 to C2, for estimating MAGPRE."""
+        t1 = self.get_time('C1')
+        t2 = self.get_time('C2')
+        return t1, t2 - t1
+
+    @cached_property
+    def _post_span(self):
+        """C4, and the duration from C3 to C4, for estimating MAGPOST."""
+        t1 = self.get_time('C3')
+        t2 = self.get_time('C4')
+        return t2, t2 - t1
+
     def get_magnitude_time(self, magnitude, post):
-        mags = self.post_magnitudes if post else self.pre_magnitudes
-        lo, hi = find_bounds(mags, magnitude, key=lambda x: x[0])
-        lo_i, (lo_m, lo_t) = lo
-        hi_i, (hi_m, hi_t) = hi
+        """Returns the time the magnitude is reached, interpolating between
+        the nearest magnitudes, or None if it is out of their range."""
+        if post:
+            values, times = self._post_mag_values, self._post_mag_times
+            # Interpolating between negated magnitudes gives the same time.
+            magnitude = -magnitude
+        else:
+            values, times = self._pre_mag_values, self._pre_mag_times
 
-        # If the bounds are the same, return the time.
-        if lo_i == hi_i:
-            return lo_t
+        i = bisect.bisect_left(values, magnitude)
+        if i == len(values):
+            return None
+
+        # If the magnitude is listed, return its time.
+        hi_m = values[i]
+        if hi_m == magnitude:
+            return times[i]
+        if i == 0:
+            return None
 
         # Else, return a time in the middle.
+        lo_m, lo_t, hi_t = values[i - 1], times[i - 1], times[i]
         delta_m = hi_m - lo_m
         percent = (magnitude - lo_m) / delta_m
         offset_t = (hi_t - lo_t) * percent
@@ -100,24 +121,36 @@ class EventManager:
         return ans
 
 
-class EventParser:
+# Patterns for lines of the contacts file.
+_DATE = r'(\d{4}/\d{2}/\d{2})'
+_TIME = r'(\d{2}:\d{2}:\d{2}\.\d)'
+_SPC = r'\s+'
+_REST = r'.*'
+_DECFRAC = r'([0-9.]+)'
+_DECFRAC_CHARS = '0123456789.'
+
+# Kinds of line, and their patterns, in the order they are tried.
+_LINE_PATTERNS = [
+    ('contact_a', r'(.).. Contact' + _SPC + _DATE + _SPC + _TIME + _REST),
+    ('contact_b', r'C(\d)' + _SPC + _DATE + _SPC + _TIME + _REST),
+    ('max', r'Max Eclipse' + _SPC + _DATE + _SPC + _TIME + _REST),
+    ('maxmag', r'Magnitude at maximum .* ' + _DECFRAC),
+]
+
+# All of the line patterns as one alternation, so each line is matched only
+# once; `lastgroup` names the kind of line that matched.
+_RE_LINE = re.compile('|'.join(f'(?P<{kind}>{pattern})'
+                               for kind, pattern in _LINE_PATTERNS))
 
-    def __init__(self):
-        date = r'(\d{4}/\d{2}/\d{2})'
-        time = r'(\d{2}:\d{2}:\d{2}\.\d)'
-        cX_a = r'(.).. Contact'
-        cX_b = r'C(\d)'
-        maxe = r'Max Eclipse'
-        spc = r'\s+'
-        rest = r'.*'
-        decfrac = r'([0-9.]+)'
-
-        self.re_cX_a = re.compile(cX_a + spc + date + spc + time + rest)
-        self.re_cX_b = re.compile(cX_b + spc + date + spc + time + rest)
-        self.re_max = re.compile(maxe + spc + date + spc + time + rest)
-        self.re_maxmag = re.compile(r'Magnitude at maximum .* ' + decfrac)
-        self.re_magn = re.compile(time + spc + decfrac + spc + decfrac + spc
-                                  + decfrac + rest)
+# Where the groups of each kind of line are, in the combined match.
+_LINE_GROUPS = {
+    kind: slice(_RE_LINE.groupindex[kind],
+                _RE_LINE.groupindex[kind] + re.compile(pattern).groups)
+    for kind, pattern in _LINE_PATTERNS
+}
+
+
+class EventParser:
 
     def parse(self, filename) -> EventManager:
         if not filename:
@@ -125,49 +158,73 @@ class EventParser:
 
         events = { }
 
-        prev_mag = float('-inf')
+        prev_mag = None
+        post = False
         pre_mags = [ ]
         post_mags = [ ]
         # Start filling pre-mags
-        magnitudes = pre_mags
+        add_magnitude = pre_mags.append
         max_magnitude = None
 
         default_date = None
 
-        with open(filename, 'r', encoding='utf', errors='replace') as file:
+        with open(filename, 'r', encoding='utf', errors='replace',
+                  buffering=1 << 20) as file:
             for line in file:
-                if m := self.re_cX_a.match(line):
-                    num, date, time = m.groups()
-                    event = f"C{num}"
-                    time = parse_date_time(date, time, tzinfo=timezone.utc)
-                    if not default_date:
-                        default_date = time.date()
-                    events[event] = time
-                elif m := self.re_cX_b.match(line):
-                    num, date, time = m.groups()
-                    event = f"C{num}"
-                    time = parse_date_time(date, time, tzinfo=timezone.utc)
-                    events[event] = time
-                elif m := self.re_max.match(line):
-                    date, time = m.groups()
-                    event = "MAX"
-                    events[event] = parse_date_time(date, time,
-                                                    tzinfo=timezone.utc)
-                elif m := self.re_maxmag.match(line):
-                    max_magnitude = m.group(1)
-                elif m := self.re_magn.match(line):
-                    time, _, _, mag = m.groups()
-                    time = parse_time(time, tzinfo=timezone.utc)
-                    date = datetime.combine(default_date, time)
-                    mag = float(mag)
-                    if prev_mag and mag < prev_mag:
-                        # We've shifted to "post"
-                        magnitudes = post_mags
-                        # Stop checking.
-                        prev_mag = None
-                    elif prev_mag:
-                        prev_mag = mag
-                    magnitudes.append((mag, date))
+                # Magnitude lines are most of the file, e.g.
+                #   17:10:00.0   12.0  45.6  0.0010
+                # They start with a time, and no other kind of line has a
+                # colon as its third character, so just split them. Like
+                # the old pattern, only accept an HH:MM:SS.s time and
+                # columns of digits and dots (so not negative altitudes).
+                if line[2:3] == ':':
+                    parts = line.split()
+                    try:
+                        if (len(parts[0]) != 10 or
+                                any(x.strip(_DECFRAC_CHARS)
+                                    for x in parts[1:4])):
+                            raise ValueError(line)
+                        time = parse_time(parts[0], tzinfo=_UTC)
+                        mag = float(parts[3])
+                    except (IndexError, ValueError):
+                        pass
+                    else:
+                        date = datetime.combine(default_date, time)
+                        if post:
+                            pass
+                        elif prev_mag is not None and mag < prev_mag:
+                            # We've shifted to "post"; stop checking.
+                            post = True
+                            add_magnitude = post_mags.append
+                        else:
+                            prev_mag = mag
+                        add_magnitude((mag, date))
+                        continue
+
+                m = _RE_LINE.match(line)
+                if not m:
+                    continue
+                groups = m.groups()[_LINE_GROUPS[m.lastgroup]]
+                match m.lastgroup:
+                    case 'contact_a':
+                        num, date, time = groups
+                        event = f"C{num}"
+                        time = parse_date_time(date, time, tzinfo=_UTC)
+                        if not default_date:
+                            default_date = time.date()
+                        events[event] = time
+                    case 'contact_b':
+                        num, date, time = groups
+                        event = f"C{num}"
+                        time = parse_date_time(date, time, tzinfo=_UTC)
+                        events[event] = time
+                    case 'max':
+                        date, time = groups
+                        event = "MAX"
+                        events[event] = parse_date_time(date, time,
+                                                        tzinfo=_UTC)
+                    case 'maxmag':
+                        max_magnitude, = groups
 
         if max_magnitude:
             logging.info(f"Max magnitude: {max_magnitude}")
@@ -1,4 +1,8 @@
 
+# standard imports
+import heapq
+from operator import attrgetter
+
 # package imports
 from .semscript import *
 from .sequence import Sequence
@@ -29,16 +33,30 @@ class Script:
     def generate_sequence(self):
         """Generates a list of Action objects from the ScriptCommands
         objects."""
-        actions = []
-        for command in self.commands:
-            more = command.generate_actions(self.events)
-            actions.extend(more)
-        return Sequence(actions)
+        # Sort each command's actions, which are mostly in order already,
+        # then merge them rather than sorting everything together.
+        by_time = attrgetter('time')
+        streams = [sorted(command.generate_actions(self.events), key=by_time)
+                   for command in self.commands]
+        # Merge on the time itself so that ties keep the commands' order.
+        merged = heapq.merge(*streams, key=by_time)
+        return Sequence(merged, presorted=True)
 
 
 class ScriptParser:
     """Class to parse an SEM script into a Script object."""
 
+    # Commands by name, and FOR loops by kind.
+    _COMMANDS = {
+        'ENDFOR': ForLoopEnd,
+        'TAKEPIC': TakePic,
+        'PLAY': Play,
+    }
+    _FOR_LOOPS = {
+        '(VAR)': ForVarLoop,
+        '(INTERVALOMETER)': ForIterLoop,
+    }
+
     def __init__(self):
         self.script = Script()
         self.stack = []
@@ -70,29 +88,17 @@ class ScriptParser:
 
 
     def _make_command(self, line):
-        args = [x for x in line.split(',')]
-
-        match args:
-
-            case ['FOR', '(VAR)', *rest]:
-                return ForVarLoop(rest)
-
-            case ['FOR', '(INTERVALOMETER)', *rest]:
-                return ForIterLoop(rest)
+        name, *rest = line.split(',')
 
-            case ['ENDFOR', *rest]:
-                return ForLoopEnd(rest)
-
-            case ['TAKEPIC', *rest]:
-                return TakePic(rest)
-
-            case ['PLAY', *rest]:
-                return Play(rest)
-
-            case [unknown, *rest]:
-                raise RuntimeError(f"Unknown command {unknown}")
+        if name == 'FOR' and rest:
+            kind, *rest = rest
+            command_cls = self._FOR_LOOPS.get(kind)
+        else:
+            command_cls = self._COMMANDS.get(name)
 
-        return None
+        if command_cls is None:
+            raise RuntimeError(f"Unknown command {name}")
+        return command_cls(rest)
 
 
     def _add_command(self, command):
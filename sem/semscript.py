@@ -3,6 +3,7 @@
 from abc import ABC, abstractmethod
 import logging
 import os
+import sys
 
 # package imports
 from .strconv import *
@@ -29,9 +30,11 @@ class ScriptCommand:
 
 
     @abstractmethod
-    def generate_actions(self, events, **kwargs):
+    def generate_actions(self, events, override_event=None,
+                         comment_suffix=''):
         """Given this command and any nested commands, generate a list of
-        Action objects."""
+        Action objects, optionally for another event, and with a suffix for
+        their comments."""
         return NotImplemented
 
 
@@ -69,20 +72,25 @@ class ForVarLoop(ScriptCommand):
         return False
 
 
-    def generate_actions(self, events, **kwargs):
+    def generate_actions(self, events, override_event=None,
+                         comment_suffix=''):
         actions = []
         value = self.start
         while value < self.end:
+            var = f'{value:04.1f}'
+            mag_suffix = f" (Mag. {var}%)"
             for c in self.commands:
-                var = f'{value:04.1f}'
-                event, post = c.event.split(' ', maxsplit=2)
-                more = c.generate_actions(events,
-                                          override_event=f"{event} {var}")
+                event = c.event_base
                 if event in ['MAGPRE', 'MAGPOST']:
-                    for action in more:
-                        action.comment += f" (Mag. {var}%)"
+                    suffix = mag_suffix
+                else:
+                    suffix = ''
+                more = c.generate_actions(events,
+                                          override_event=f"{event} {var}",
+                                          comment_suffix=suffix)
                 actions.extend(more)
-                value += self.step
+            # Every command runs for each value.
+            value += self.step
         return actions
 
 
@@ -124,23 +132,23 @@ class ForIterLoop(ScriptCommand):
         return False
 
 
-    def generate_actions(self, events, **kwargs):
-        actions = []
+    def generate_actions(self, events, override_event=None,
+                         comment_suffix=''):
+        # The commands' times only move by the delay, so look them up once.
+        base_times = [(c, c.base_time(events)) for c in self.commands]
+        # Each iteration's offset from those, and its comment suffix.
+        iterations = []
+        step = -self.delay if self.kind == 0 else self.delay
         value = 0.0
         for i in range(self.iters):
-            for c in self.commands:
-                microsec = int(value * 100) * 10_000
-                var = timedelta(microseconds=microsec)
-                more = c.generate_actions(events)
-                for action in more:
-                    action.time += var
-                    action.comment += f" (iter. {i+1:03d})"
-                actions.extend(more)
-            if self.kind == 0:
-                value -= self.delay
-            else:
-                value += self.delay
-        return actions
+            microsec = int(value * 100) * 10_000
+            iterations.append((timedelta(microseconds=microsec),
+                               f" (iter. {i+1:03d})"))
+            value += step
+        # Build the actions in a single pass, iteration by iteration.
+        return [c.make_action(base_time + var, suffix)
+                for var, suffix in iterations
+                for c, base_time in base_times]
 
 
 class ForLoopEnd(ScriptCommand):
@@ -162,7 +170,8 @@ class ForLoopEnd(ScriptCommand):
         raise ValueError("ENDFOR is not a compound command")
 
 
-    def generate_actions(self, events, **kwargs):
+    def generate_actions(self, events, override_event=None,
+                         comment_suffix=''):
         raise ValueError("ENDFOR should never actually be in scripts")
 
 
@@ -173,6 +182,8 @@ class Play(ScriptCommand):
         try:
             (event, sign, offset, file, _, _, _, _, _, _, _, comment) = args
             self.event = event
+            # The event without any variable part, e.g. MAGPRE (VAR).
+            self.event_base = sys.intern(event.partition(' ')[0])
             self.offset = parse_time_delta(sign, offset)
             file, _ = os.path.splitext(file)
             self.file = f"{file}.mp3"
@@ -194,11 +205,21 @@ class Play(ScriptCommand):
         raise ValueError("PLAY is not a compound command")
 
 
-    def generate_actions(self, events, **kwargs):
-        event = kwargs.get('override_event', self.event)
-        time = events.get_time(event) + self.offset
-        action = ActionPlay(time=time, soundfile=self.file,
-                            comment=self.comment)
+    def base_time(self, events, event=None):
+        """Returns the time of the event, plus the offset."""
+        return events.get_time(event or self.event) + self.offset
+
+
+    def make_action(self, time, comment_suffix=''):
+        """Returns the action, at the given time."""
+        return ActionPlay(time=time, soundfile=self.file,
+                          comment=self.comment + comment_suffix)
+
+
+    def generate_actions(self, events, override_event=None,
+                         comment_suffix=''):
+        time = self.base_time(events, override_event)
+        action = self.make_action(time, comment_suffix)
         # Just one action
         return [action]
 
@@ -211,8 +232,12 @@ class TakePic(ScriptCommand):
             (event, sign, offset, camera, shutter, aperture, iso, burst,
              quality, size, incremental, comment) = args
             self.event = event
+            # The event without any variable part, e.g. MAGPRE (VAR).
+            self.event_base = sys.intern(event.partition(' ')[0])
             self.offset = parse_time_delta(sign, offset)
             self.shutter_sec = parse_shutter(shutter)
+            # Written out as given, which the camera also understands.
+            self.shutter = shutter.strip()
             self.aperture = float(aperture)
             self.iso = int(iso)
             self.comment = comment
@@ -233,12 +258,22 @@ class TakePic(ScriptCommand):
         raise ValueError("PLAY is not a compound command")
 
 
-    def generate_actions(self, events, **kwargs):
-        event = kwargs.get('override_event', self.event)
-        time = events.get_time(event) + self.offset
-        action = ActionTakePic(time=time, shutter=self.shutter_sec,
-                               aperture=self.aperture, iso=self.iso,
-                               comment=self.comment)
+    def base_time(self, events, event=None):
+        """Returns the time of the event, plus the offset."""
+        return events.get_time(event or self.event) + self.offset
+
+
+    def make_action(self, time, comment_suffix=''):
+        """Returns the action, at the given time."""
+        return ActionTakePic(time=time, shutter=self.shutter,
+                             aperture=self.aperture, iso=self.iso,
+                             comment=self.comment + comment_suffix)
+
+
+    def generate_actions(self, events, override_event=None,
+                         comment_suffix=''):
+        time = self.base_time(events, override_event)
+        action = self.make_action(time, comment_suffix)
         # Just one action
         return [action]
 
@@ -2,6 +2,8 @@
 # standard imports
 import csv
 from datetime import timezone
+import io
+from operator import attrgetter
 import sys
 
 # package imports
@@ -9,53 +11,59 @@ from .action import ActionTakePic, ActionPlay
 from .fields import *
 from .strconv import parse_date_time
 
+# Sequence times are in UTC.
+_UTC = timezone.utc
+
 
 class Sequence:
     """Sequence of timed Action objects."""
 
-    def __init__(self, actions=None):
-        self.actions = actions or [ ]
-        # Sort the actions.
-        self.actions = list(sorted(self.actions))
+    def __init__(self, actions=None, presorted=False):
+        """Actions may be any iterable; unless `presorted`, they are
+        sorted by time."""
+        actions = actions or [ ]
+        if presorted:
+            self.actions = list(actions)
+        else:
+            self.actions = sorted(actions, key=attrgetter('time'))
 
 
     def write_csv(self, file=None):
         """Writes the sequence into a CSV file with a header row."""
 
         file = file or sys.stdout
-        writer = csv.DictWriter(file, fieldnames=FIELD_NAMES)
-        writer.writeheader()
-        for row in self.actions:
-            writer.writerow(row.as_dict())
+        # Format everything into memory, then write it all at once.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(FIELD_NAMES)
+        writer.writerows(action.as_row() for action in self.actions)
+        file.write(buffer.getvalue())
 
 
     def read_csv(self, file):
         """Reads a sequence from a CSV file with an optional header row."""
         # Clear actions.
         self.actions = []
-        reader = csv.DictReader(file, fieldnames=FIELD_NAMES)
-        for row in reader:
+        for row in csv.reader(file):
+            if not row or row[0] == F_DATE:
+                # blank or header row
+                continue
             action = self._make_action(row)
             if action:
                 self.actions.append(action)
 
 
     def _make_action(self, csv_row):
-        """Construct an Action object corresponding to a CSV data row."""
-        if csv_row[F_DATE] == 'date':
-            # header row
-            return None
+        """Construct an Action object corresponding to a CSV data row, with
+        its fields in `FIELD_NAMES` order."""
+        # Fill in any missing fields, as DictReader would.
+        if len(csv_row) < len(FIELD_NAMES):
+            csv_row += [None] * (len(FIELD_NAMES) - len(csv_row))
 
         # Extract fields
-        time = parse_date_time(csv_row[F_DATE], csv_row[F_TIME],
-                               tzinfo=timezone.utc)
-
-        action = csv_row[F_ACTION]
-        shutter = csv_row[F_SHUTTER]
-        aperture = csv_row[F_APERTURE]
-        iso = csv_row[F_ISO]
-        file = csv_row[F_FILE]
-        comment = csv_row[F_COMMENT]
+        (date, time, action, shutter, aperture, iso, file,
+         comment) = csv_row[:len(FIELD_NAMES)]
+        time = parse_date_time(date, time, tzinfo=_UTC)
 
         match action:
             case 'PICT':
@@ -63,5 +71,3 @@ class Sequence:
 
             case 'PLAY':
                 return ActionPlay(time, file, comment)
-
-
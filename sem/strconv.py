@@ -13,53 +13,68 @@ def format_time(time):
     return time.strftime('%H:%M:%S.%f')[:-5]
 
 
+def format_date_time(date_time: datetime):
+    """Format the date and time, as `format_date` and `format_time` would,
+    with a single strftime call."""
+    date, time = date_time.strftime('%Y/%m/%d %H:%M:%S.%f').split(' ')
+    return date, time[:-5]
+
+
 def parse_date(date_str) -> datetime:
     """Parse a date string of the form Y/M/D."""
+
+    # Zero-padded dates only need ISO 8601 separators, and fromisoformat()
+    # is much faster than splitting them up.
     try:
-        y4, m2, d2 = [int(x) for x in date_str.split('/')]
-        return datetime(year=y4, month=m2, day=d2)
+        return datetime.fromisoformat(date_str.replace('/', '-'))
     except ValueError:
         pass
 
-    raise ValueError(f"Failed to parse date string: {date_str}")
+    try:
+        y4, m2, d2 = [int(x) for x in date_str.split('/')]
+        return datetime(year=y4, month=m2, day=d2)
+    except ValueError:
+        raise ValueError(f"Failed to parse date string: {date_str}") from None
 
 
 def parse_time(time_str, tzinfo=None) -> datetime:
     """Parse a time string of the form H:M:S.s."""
 
+    # Likewise, zero-padded times are ISO 8601 already.
     try:
-        hh, mm, ss = [x for x in time_str.split(':')]
-        hh = int(hh)
-        mm = int(mm)
-        ss, tenths = ss.split('.')
-        ss = int(ss)
-        micro = int(tenths) * 100_000
-        return time(hour=int(hh), minute=int(mm), second=int(ss),
-                    microsecond=micro, tzinfo=tzinfo)
+        return time.fromisoformat(time_str).replace(tzinfo=tzinfo)
     except ValueError:
         pass
 
-    raise ValueError(f"Failed to parse time string: {time_str}")
+    try:
+        hh, mm, ss = time_str.split(':')
+        ss, tenths = ss.split('.')
+        return time(hour=int(hh), minute=int(mm), second=int(ss),
+                    microsecond=int(tenths) * 100_000, tzinfo=tzinfo)
+    except ValueError:
+        raise ValueError(f"Failed to parse time string: {time_str}") from None
 
 
 def parse_date_time(date_str, time_str, tzinfo=None) -> datetime:
     """Parse separate date and time strings."""
 
+    # Likewise for both together.
     try:
-        y4, m2, d2 = [int(x) for x in date_str.split('/')]
-        hh, mm, ss = [x for x in time_str.split(':')]
+        iso = f"{date_str.replace('/', '-')}T{time_str}"
+        return datetime.fromisoformat(iso).replace(tzinfo=tzinfo)
+    except ValueError:
+        pass
 
-        hh = int(hh)
-        mm = int(mm)
+    try:
+        y4, m2, d2 = [int(x) for x in date_str.split('/')]
+        hh, mm, ss = time_str.split(':')
         ss, tenths = ss.split('.')
-        ss = int(ss)
-        micro = int(tenths) * 100_000
         return datetime(year=y4, month=m2, day=d2,
-                       hour=int(hh), minute=int(mm), second=int(ss),
-                       microsecond=micro, tzinfo=tzinfo)
+                        hour=int(hh), minute=int(mm), second=int(ss),
+                        microsecond=int(tenths) * 100_000, tzinfo=tzinfo)
     except ValueError:
         raise ValueError(f"Failed to parse date-time string: "
-                         f"{date_str} or {time_str}")
+                         f"{date_str} or {time_str}") from None
 
 
 def parse_time_delta(sign_str, time_str):
@@ -2,10 +2,11 @@
 
 # standard imports
 import argparse
-from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
 import logging
 import os
+import queue
+import threading
 import time
 import traceback as tb
 
@@ -21,6 +22,9 @@ import sem
 
 SOUNDS_DIR = 'sounds'
 
+# How many sounds can play at once.
+PLAY_WORKERS = 4
+
 
 class Sequencer:
 
@@ -36,7 +40,21 @@ class Sequencer:
         else:
             self.camera = self._select_camera(args)
         self.time_offset = self._set_clock(args)
-        self.executor = ThreadPoolExecutor()
+
+        # Long-lived workers, fed by a queue for each kind of action:
+        # pictures are taken one at a time, but sounds may overlap.
+        self._pict_queue = queue.SimpleQueue()
+        self._play_queue = queue.SimpleQueue()
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True,
+                             args=(self._pict_queue, self._execute_pict)),
+        ] + [
+            threading.Thread(target=self._work, daemon=True,
+                             args=(self._play_queue, self._execute_play))
+            for _ in range(PLAY_WORKERS)
+        ]
+        for worker in self._workers:
+            worker.start()
 
 
     def _collect_actions(self, args):
@@ -52,6 +70,9 @@ class Sequencer:
                     actions_out.append(action)
             elif isinstance(action, sem.ActionPlay):
                 if not self.no_sound:
+                    # Resolve the sound file now, rather than when playing.
+                    action.soundfile = os.path.join(SOUNDS_DIR,
+                                                    action.soundfile)
                     actions_out.append(action)
         return actions_out
 
@@ -66,7 +87,8 @@ class Sequencer:
         if args.time:
             current = dt.datetime.now().astimezone()
             virtual = args.time.astimezone()
-            logging.info(f"Setting virtual time to {virtual} from {current}")
+            logging.info("Setting virtual time to %s from %s",
+                         virtual, current)
             return args.time.astimezone() - dt.datetime.now().astimezone()
         else:
             return dt.timedelta()
@@ -78,32 +100,52 @@ class Sequencer:
 
     def execute(self):
         for action in self.actions:
-            now = self._current_time()
-            delay = action.time - now
-            delay_sec = delay.total_seconds()
+            # Read the (virtual) wall clock for each action, so that clock
+            # corrections and host sleep only skip what is already past.
+            delay_sec = (action.time - self._current_time()).total_seconds()
+            target = time.monotonic() + delay_sec
 
             if delay_sec < 0:
                 # Skip the command (time travel)
                 continue
 
-            logging.info(f"Next command in {delay_sec} seconds")
+            logging.info("Next command in %s seconds", delay_sec)
 
-            if delay_sec > 0:
+            # Sleep until the deadline, in case a sleep ends early.
+            while delay_sec > 0:
                 time.sleep(delay_sec)
+                delay_sec = target - time.monotonic()
 
             self._execute_action(action)
 
+        self._finish()
+
 
     def _execute_action(self, action):
         if isinstance(action, sem.ActionTakePic):
-            self.executor.submit(self._execute_pict, action)
+            self._pict_queue.put(action)
         elif isinstance(action, sem.ActionPlay):
-            self.executor.submit(self._execute_play, action)
+            self._play_queue.put(action)
+
+
+    def _work(self, actions, execute):
+        """Executes actions from the queue, until it gets None."""
+        while (action := actions.get()) is not None:
+            execute(action)
+
+
+    def _finish(self):
+        """Waits for the workers to execute all queued actions."""
+        self._pict_queue.put(None)
+        for _ in range(PLAY_WORKERS):
+            self._play_queue.put(None)
+        for worker in self._workers:
+            worker.join()
 
 
     def _execute_play(self, action):
-        filename = os.path.join(SOUNDS_DIR, action.soundfile)
-        logging.info(f"Play: {filename}")
+        filename = action.soundfile
+        logging.info("Play: %s", filename)
         try:
             playsound(filename)
         except:
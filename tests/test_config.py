@@ -0,0 +1,95 @@
+"""Tests for finding the setting widgets in camera.config."""
+
+# standard imports
+import sys
+import types
+import unittest
+
+
+# python-gphoto2 needs the native libgphoto2, so stand in for the parts of it
+# that the camera package touches, unless it is actually installed.
+try:
+    import gphoto2
+except ImportError:
+    gphoto2 = types.ModuleType('gphoto2')
+    gphoto2.GPhoto2Error = type('GPhoto2Error', (Exception,), { })
+    (gphoto2.GP_WIDGET_WINDOW, gphoto2.GP_WIDGET_SECTION,
+     gphoto2.GP_WIDGET_TEXT, gphoto2.GP_WIDGET_RANGE,
+     gphoto2.GP_WIDGET_TOGGLE, gphoto2.GP_WIDGET_RADIO,
+     gphoto2.GP_WIDGET_MENU, gphoto2.GP_WIDGET_BUTTON,
+     gphoto2.GP_WIDGET_DATE) = range(9)
+    sys.modules['gphoto2'] = gphoto2
+
+from camera.config import CameraConfig
+
+
+class FakeWidget:
+    """Just enough of a gp.widget for CameraConfig."""
+
+    def __init__(self, name, wtype, value=None, choices=(), children=()):
+        self.name = name
+        self.wtype = wtype
+        self.value = value
+        self.choices = list(choices)
+        self.children = list(children)
+
+    def get_name(self):
+        return self.name
+
+    def get_type(self):
+        return self.wtype
+
+    def get_children(self):
+        return iter(self.children)
+
+    def get_choices(self):
+        return iter(self.choices)
+
+    def get_value(self):
+        return self.value
+
+
+def radio(name, value, choices):
+    return FakeWidget(name, gphoto2.GP_WIDGET_RADIO, value, choices)
+
+
+def make_tree(aperture_names=('aperture', 'f-number')):
+    # Both aperture names come before the shutter speed.
+    apertures = [radio(name, 'f/8', ['f/4', 'f/8'])
+                 for name in aperture_names]
+    return FakeWidget('main', gphoto2.GP_WIDGET_WINDOW, children=[
+        FakeWidget('capturesettings', gphoto2.GP_WIDGET_SECTION, children=[
+            *apertures,
+            radio('iso', '100', ['100', '200']),
+            radio('shutterspeed', '1/125', ['1/125', '1/500']),
+        ]),
+    ])
+
+
+class TestCameraConfig(unittest.TestCase):
+
+    def check_controllers(self, config):
+        self.assertEqual(config.iso_ctrl.widget.name, 'iso')
+        # 'f-number' is preferred, wherever it is in the tree.
+        self.assertEqual(config.aperture_ctrl.widget.name, 'f-number')
+        self.assertEqual(config.shutterspeed_ctrl.widget.name, 'shutterspeed')
+
+    def test_finds_all_controllers_with_both_aperture_names(self):
+        self.check_controllers(CameraConfig(make_tree()))
+
+    def test_finds_all_controllers_when_dumping(self):
+        self.check_controllers(CameraConfig(make_tree(), dump=True))
+
+    def test_prefers_f_number_listed_first(self):
+        names = ('f-number', 'aperture')
+        self.check_controllers(CameraConfig(make_tree(names)))
+        self.check_controllers(CameraConfig(make_tree(names), dump=True))
+
+    def test_finds_aperture_alone(self):
+        for dump in (False, True):
+            config = CameraConfig(make_tree(('aperture',)), dump=dump)
+            self.assertEqual(config.aperture_ctrl.widget.name, 'aperture')
+
+
+if __name__ == '__main__':
+    unittest.main()
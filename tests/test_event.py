@@ -0,0 +1,55 @@
+"""Tests for parsing contact files in sem.event."""
+
+# standard imports
+from datetime import datetime, timezone
+import os
+import tempfile
+import unittest
+
+from sem import EventParser
+
+
+# Magnitudes rise from exactly 0.0, and fall back to it.
+CONTACTS = """\
+Detailed Local Circumstances
+Magnitude at maximum :            1.0000
+1st Contact   2024/04/08  17:10:00.0   alt 50
+4th Contact   2024/04/08  17:14:00.0   alt 50
+
+17:10:00.0   12.0  45.6  0.0000
+17:11:00.0   12.1  45.6  0.5000
+17:12:00.0   12.2  45.6  1.0000
+17:13:00.0   12.3  45.6  0.5000
+17:14:00.0   12.4  45.6  0.0000
+"""
+
+
+def at(minute):
+    return datetime(2024, 4, 8, 17, minute, tzinfo=timezone.utc)
+
+
+class TestEventParser(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(fd, 'w') as file:
+            file.write(CONTACTS)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_splits_magnitudes_starting_at_zero(self):
+        events = EventParser().parse(self.filename)
+        self.assertEqual(events.pre_magnitudes,
+                         [(0.0, at(10)), (0.5, at(11)), (1.0, at(12))])
+        self.assertEqual(events.post_magnitudes,
+                         [(0.5, at(13)), (0.0, at(14))])
+
+    def test_finds_magnitude_times(self):
+        events = EventParser().parse(self.filename)
+        self.assertEqual(events.get_time('MAGPRE 50'), at(11))
+        self.assertEqual(events.get_time('MAGPOST 50'), at(13))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Tests for generating actions from SEM script commands."""
+
+# standard imports
+from datetime import datetime, timedelta, timezone
+import unittest
+
+from sem.semscript import ForVarLoop, TakePic
+
+
+class FakeEvents:
+    """Gives every event a distinct time, and records the ones asked for."""
+
+    def __init__(self):
+        self.names = []
+
+    def get_time(self, name):
+        self.names.append(name)
+        return (datetime(2024, 4, 8, tzinfo=timezone.utc)
+                + timedelta(minutes=len(self.names)))
+
+
+def take_pic(event, comment):
+    return TakePic([event, '+', '00:00:00.0', 'EOS', '1/500', '8.0', '200',
+                    '0', 'RAW', '', 'N', comment])
+
+
+class TestForVarLoop(unittest.TestCase):
+
+    def test_each_value_runs_every_command(self):
+        loop = ForVarLoop(['10', '10', '60'])
+        loop.add_command(take_pic('MAGPRE (VAR)', 'pre'))
+        loop.add_command(take_pic('MAGPOST (VAR)', 'post'))
+        events = FakeEvents()
+        actions = loop.generate_actions(events)
+
+        values = ['10.0', '20.0', '30.0', '40.0', '50.0']
+        self.assertEqual(events.names,
+                         [f"{event} {value}"
+                          for value in values
+                          for event in ['MAGPRE', 'MAGPOST']])
+        self.assertEqual([action.comment for action in actions],
+                         [f"{comment} (Mag. {value}%)"
+                          for value in values
+                          for comment in ['pre', 'post']])
+
+
+if __name__ == '__main__':
+    unittest.main()